@@ -52,6 +52,7 @@ def main() -> int:
 
     print(f"[boot] pod={pod_name} node_id={node_id} url={url} cfg={cfg}", flush=True)
 
+    pow2 = [1 << k for k in range(max_retries)]
     for k in range(max_retries):
         ok = http_probe(url, timeout=timeout)
 
@@ -59,10 +60,10 @@ def main() -> int:
             print(f"[ok] pod={pod_name} reached {url} at retry={k}", flush=True)
             return 0
 
+        base = cfg.base_seconds * pow2[k]
         rng_offset = None
         if hybrid_prob > 0.0 and rng.random() < hybrid_prob:
             offset = rng.randrange(cfg.slots_M)
-            base = cfg.base_seconds * (2 ** k)
             jitter = (offset * cfg.slot_ms) / 1000.0
             wait = min(cfg.cap_seconds, base + jitter)
             mode = "rng"
@@ -78,7 +79,7 @@ def main() -> int:
             mode_note = "rng_offset=-"
         print(
             f"[retry] pod={pod_name} id={node_id} k={k} mode={mode} {mode_note} wait={wait:.4f}s "
-            f"(base={cfg.base_seconds*(2**k):.4f}s + jitter)",
+            f"(base={base:.4f}s + jitter)",
             flush=True,
         )
 
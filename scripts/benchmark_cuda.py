@@ -0,0 +1,40 @@
+"""CUDA path for benchmark_jitter.py --device cuda (requires numba)."""
+from __future__ import annotations
+
+import numpy as np
+from numba import cuda
+
+from collatz_backoff import BackoffConfig, CollatzBackoff
+
+# The (steps, slots_M) uint8 occupancy grid lives in device memory.
+MAX_GRID_BYTES = 1 << 30
+
+
+@cuda.jit
+def mark_slots(a, b, M, pow2, n, occupied):
+    i, k = cuda.grid(2)
+    if i < n and k < a.shape[0]:
+        x = a[k] * i + b[k]
+        occupied[k, x & (M - 1) if pow2 else x % M] = 1
+
+
+def run_collatz_cuda(slots_M: int, replicas: int, steps: int, seed: int) -> dict[int, int]:
+    """
+    GPU variant of run_collatz (requires numba with a CUDA device).
+    One thread per (id, step) marks its slot in a (steps, slots_M) occupancy
+    grid, so the (steps, replicas) offset matrix never has to be stored.
+    """
+    cfg = BackoffConfig(slots_M=slots_M, collatz_seed=seed, slot_ms=1)
+    b = CollatzBackoff(cfg)
+    params = np.array([b.affine_params(k) for k in range(steps)], dtype=np.int64).reshape(steps, 2)
+    a_dev = cuda.to_device(np.ascontiguousarray(params[:, 0]))
+    b_dev = cuda.to_device(np.ascontiguousarray(params[:, 1]))
+    occupied = cuda.to_device(np.zeros((steps, slots_M), dtype=np.uint8))
+
+    threads = (256, 4)
+    blocks = ((replicas + threads[0] - 1) // threads[0], (steps + threads[1] - 1) // threads[1])
+    pow2 = slots_M & (slots_M - 1) == 0
+    mark_slots[blocks, threads](a_dev, b_dev, slots_M, pow2, replicas, occupied)
+
+    used = np.count_nonzero(occupied.copy_to_host(), axis=1)
+    return {k: replicas - int(used[k]) for k in range(steps)}
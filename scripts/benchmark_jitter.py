@@ -2,30 +2,48 @@
 from __future__ import annotations
 
 import argparse
-import random
 from collections import Counter
 
+import numpy as np
+
 from collatz_backoff import BackoffConfig, CollatzBackoff
 
 
+# bincount allocates one counter per slot, so it only beats np.unique
+# (which sorts the offsets) while the slot range stays small.
+BINCOUNT_MAX_SLOTS = 1 << 16
+
+
+def count_collisions(offsets, slots_M: int) -> int:
+    """Number of participants that share a slot with an earlier one."""
+    if isinstance(offsets, np.ndarray):
+        if slots_M <= BINCOUNT_MAX_SLOTS:
+            used = np.count_nonzero(np.bincount(offsets))
+        else:
+            used = np.unique(offsets).size
+        return offsets.size - int(used)
+    return len(offsets) - len(set(offsets))
+
+
 def run_collatz(slots_M: int, replicas: int, steps: int, seed: int) -> dict[int, int]:
     cfg = BackoffConfig(slots_M=slots_M, collatz_seed=seed, slot_ms=1)
     b = CollatzBackoff(cfg)
+    ids = np.arange(replicas, dtype=np.int64)
     collisions = {}
 
     for k in range(steps):
-        offsets = [b.offset_slot(i, k) for i in range(replicas)]
-        collisions[k] = replicas - len(set(offsets))
+        offsets = b.offset_slot_batch(ids, k)
+        collisions[k] = count_collisions(offsets, slots_M)
     return collisions
 
 
 def run_random(slots_M: int, replicas: int, steps: int, rng_seed: int) -> dict[int, int]:
-    rng = random.Random(rng_seed)
+    rng = np.random.default_rng(rng_seed)
     collisions = {}
 
     for k in range(steps):
-        offsets = [rng.randrange(slots_M) for _ in range(replicas)]
-        collisions[k] = replicas - len(set(offsets))
+        offsets = rng.integers(0, slots_M, size=replicas)
+        collisions[k] = count_collisions(offsets, slots_M)
     return collisions
 
 
@@ -34,17 +52,15 @@ def run_hybrid(
 ) -> dict[int, int]:
     cfg = BackoffConfig(slots_M=slots_M, collatz_seed=seed, slot_ms=1)
     b = CollatzBackoff(cfg)
-    rng = random.Random(rng_seed)
+    rng = np.random.default_rng(rng_seed)
+    ids = np.arange(replicas, dtype=np.int64)
     collisions = {}
 
     for k in range(steps):
-        offsets = []
-        for i in range(replicas):
-            if rng.random() < prob:
-                offsets.append(rng.randrange(slots_M))
-            else:
-                offsets.append(b.offset_slot(i, k))
-        collisions[k] = replicas - len(set(offsets))
+        use_rng = rng.random(replicas) < prob
+        rand = rng.integers(0, slots_M, size=replicas)
+        offsets = np.where(use_rng, rand, b.offset_slot_batch(ids, k))
+        collisions[k] = count_collisions(offsets, slots_M)
     return collisions
 
 
@@ -74,14 +90,39 @@ def main() -> int:
         default=0.1,
         help="Probability of RNG jitter in hybrid mode.",
     )
+    parser.add_argument(
+        "--device",
+        choices=["cpu", "cuda"],
+        default="cpu",
+        help=(
+            "Where to run collatz mode; cuda requires numba and a CUDA GPU, "
+            "and a steps x slots occupancy grid of at most 1 GiB of device memory."
+        ),
+    )
     args = parser.parse_args()
 
+    run = run_collatz
+    if args.device == "cuda":
+        # Imported here so CPU runs do not pay for loading numba.
+        try:
+            from benchmark_cuda import MAX_GRID_BYTES, cuda, run_collatz_cuda
+        except ImportError:
+            parser.error("--device cuda requires numba")
+        if not cuda.is_available():
+            parser.error("--device cuda requires a CUDA-capable GPU")
+        if args.steps * args.slots > MAX_GRID_BYTES:
+            parser.error(
+                f"--device cuda needs a steps x slots grid of {args.steps * args.slots} bytes "
+                f"(limit {MAX_GRID_BYTES}); lower --steps or --slots"
+            )
+        run = run_collatz_cuda
+
     print("Benchmark: collision counts per retry step")
     print(f"slots={args.slots} replicas={args.replicas} steps={args.steps}")
     print()
 
     if args.mode in ("collatz", "all"):
-        collatz = run_collatz(args.slots, args.replicas, args.steps, args.seed)
+        collatz = run(args.slots, args.replicas, args.steps, args.seed)
         summarize("collatz", collatz)
 
     if args.mode in ("random", "all"):
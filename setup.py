@@ -0,0 +1,19 @@
+import sys
+
+from setuptools import Extension, setup
+
+# Optional C kernel: if it fails to build (no compiler, e.g. slim images),
+# installation continues and collatz_backoff._kernels falls back to
+# Numba/NumPy.
+extra_compile_args = [] if sys.platform == "win32" else ["-O3"]
+
+setup(
+    ext_modules=[
+        Extension(
+            "collatz_backoff._collatz_ext",
+            sources=["src/collatz_backoff/_collatz_ext.c"],
+            extra_compile_args=extra_compile_args,
+            optional=True,
+        )
+    ],
+)
@@ -0,0 +1,148 @@
+/*
+ * Optional C kernel for collatz_backoff._kernels.
+ *
+ *   out[k*N + i] = (a[k] * ids[i] + b[k]) mod M
+ *
+ * The inner loop is a plain multiply-add-reduce over contiguous int64
+ * arrays so the compiler can auto-vectorize it.
+ */
+#define PY_SSIZE_T_CLEAN
+#include <Python.h>
+#include <stdint.h>
+#include <string.h>
+
+static void
+offsets_pow2(const int64_t *a, const int64_t *b, const int64_t *ids,
+             uint64_t mask, Py_ssize_t K, Py_ssize_t N, int64_t *out)
+{
+    /* Unsigned wraparound is exact modulo any power-of-two M. */
+    for (Py_ssize_t k = 0; k < K; k++) {
+        const uint64_t ak = (uint64_t)a[k];
+        const uint64_t bk = (uint64_t)b[k];
+        int64_t *row = out + k * N;
+        for (Py_ssize_t i = 0; i < N; i++) {
+            row[i] = (int64_t)((ak * (uint64_t)ids[i] + bk) & mask);
+        }
+    }
+}
+
+static void
+offsets_mod(const int64_t *a, const int64_t *b, const int64_t *ids,
+            int64_t M, Py_ssize_t K, Py_ssize_t N, int64_t *out)
+{
+    for (Py_ssize_t k = 0; k < K; k++) {
+        const int64_t ak = a[k];
+        const int64_t bk = b[k];
+        int64_t *row = out + k * N;
+        for (Py_ssize_t i = 0; i < N; i++) {
+            int64_t r = (ak * ids[i] + bk) % M;
+            row[i] = r < 0 ? r + M : r;  /* Python floor-mod semantics */
+        }
+    }
+}
+
+static int
+get_int64_buffer(PyObject *obj, Py_buffer *view, int writable, const char *name)
+{
+    int flags = PyBUF_C_CONTIGUOUS | PyBUF_FORMAT;
+    if (writable) {
+        flags |= PyBUF_WRITABLE;
+    }
+    if (PyObject_GetBuffer(obj, view, flags) < 0) {
+        return -1;
+    }
+
+    const char *fmt = view->format ? view->format : "B";
+    if (*fmt == '@' || *fmt == '=' || *fmt == '<') {
+        fmt++;
+    }
+    if (view->itemsize != 8 || (strcmp(fmt, "q") != 0 && strcmp(fmt, "l") != 0)) {
+        PyErr_Format(PyExc_TypeError, "%s must be a contiguous int64 buffer", name);
+        PyBuffer_Release(view);
+        return -1;
+    }
+    return 0;
+}
+
+static PyObject *
+ext_offsets_block(PyObject *self, PyObject *args)
+{
+    PyObject *a_obj, *b_obj, *ids_obj, *out_obj;
+    long long M;
+    int pow2;
+    Py_buffer a, b, ids, out;
+
+    if (!PyArg_ParseTuple(args, "OOOLpO", &a_obj, &b_obj, &ids_obj, &M, &pow2, &out_obj)) {
+        return NULL;
+    }
+    if (M <= 1) {
+        PyErr_SetString(PyExc_ValueError, "M must be > 1");
+        return NULL;
+    }
+
+    if (get_int64_buffer(a_obj, &a, 0, "a") < 0) {
+        return NULL;
+    }
+    if (get_int64_buffer(b_obj, &b, 0, "b") < 0) {
+        goto fail_a;
+    }
+    if (get_int64_buffer(ids_obj, &ids, 0, "ids") < 0) {
+        goto fail_b;
+    }
+    if (get_int64_buffer(out_obj, &out, 1, "out") < 0) {
+        goto fail_ids;
+    }
+
+    Py_ssize_t K = a.len / 8;
+    Py_ssize_t N = ids.len / 8;
+    if (b.len != a.len || out.len != K * N * 8) {
+        PyErr_SetString(PyExc_ValueError, "shape mismatch: expected len(a) == len(b) and out of size K*N");
+        goto fail_out;
+    }
+
+    Py_BEGIN_ALLOW_THREADS
+    if (pow2) {
+        offsets_pow2(a.buf, b.buf, ids.buf, (uint64_t)(M - 1), K, N, out.buf);
+    }
+    else {
+        offsets_mod(a.buf, b.buf, ids.buf, (int64_t)M, K, N, out.buf);
+    }
+    Py_END_ALLOW_THREADS
+
+    PyBuffer_Release(&out);
+    PyBuffer_Release(&ids);
+    PyBuffer_Release(&b);
+    PyBuffer_Release(&a);
+    Py_RETURN_NONE;
+
+fail_out:
+    PyBuffer_Release(&out);
+fail_ids:
+    PyBuffer_Release(&ids);
+fail_b:
+    PyBuffer_Release(&b);
+fail_a:
+    PyBuffer_Release(&a);
+    return NULL;
+}
+
+static PyMethodDef ext_methods[] = {
+    {"offsets_block", ext_offsets_block, METH_VARARGS,
+     "offsets_block(a, b, ids, M, pow2, out) -> None\n\n"
+     "Fill out[k, i] = (a[k] * ids[i] + b[k]) mod M for int64 buffers."},
+    {NULL, NULL, 0, NULL},
+};
+
+static struct PyModuleDef ext_module = {
+    PyModuleDef_HEAD_INIT,
+    "_collatz_ext",
+    "Optional C kernels for collatz_backoff.",
+    -1,
+    ext_methods,
+};
+
+PyMODINIT_FUNC
+PyInit__collatz_ext(void)
+{
+    return PyModule_Create(&ext_module);
+}
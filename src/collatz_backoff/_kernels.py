@@ -0,0 +1,107 @@
+from __future__ import annotations
+
+import numpy as np
+
+try:
+    from numba import njit
+except ImportError:  # optional: fall back to NumPy broadcasting
+    njit = None
+
+try:
+    from . import _collatz_ext
+except ImportError:  # optional: built from _collatz_ext.c when a compiler is available
+    _collatz_ext = None
+
+
+# --------------------------
+# NumPy fallback
+# --------------------------
+def _offsets_block_np(a: np.ndarray, b: np.ndarray, ids: np.ndarray, M: int, pow2: bool) -> np.ndarray:
+    x = a[:, None] * ids[None, :] + b[:, None]
+    return x & (M - 1) if pow2 else x % M
+
+
+def _waits_block_np(
+    a: np.ndarray,
+    b: np.ndarray,
+    base_us: np.ndarray,
+    ids: np.ndarray,
+    M: int,
+    pow2: bool,
+    slot_us: int,
+    cap_us: int,
+) -> np.ndarray:
+    offs = _offsets_block_np(a, b, ids, M, pow2)
+    return np.minimum(cap_us, base_us[:, None] + offs * slot_us)
+
+
+# --------------------------
+# Numba kernels (optional)
+# --------------------------
+if njit is not None:
+
+    @njit(cache=True, boundscheck=False)
+    def _offsets_block_jit(a, b, ids, M, pow2):  # pragma: no cover - compiled
+        K = a.shape[0]
+        N = ids.shape[0]
+        out = np.empty((K, N), dtype=np.int64)
+        mask = M - 1
+        for k in range(K):
+            ak = a[k]
+            bk = b[k]
+            if pow2:
+                for i in range(N):
+                    out[k, i] = (ak * ids[i] + bk) & mask
+            else:
+                for i in range(N):
+                    out[k, i] = (ak * ids[i] + bk) % M
+        return out
+
+    @njit(cache=True, boundscheck=False)
+    def _waits_block_jit(a, b, base_us, ids, M, pow2, slot_us, cap_us):  # pragma: no cover - compiled
+        out = _offsets_block_jit(a, b, ids, M, pow2)
+        K, N = out.shape
+        for k in range(K):
+            bk = base_us[k]
+            for i in range(N):
+                w = bk + out[k, i] * slot_us
+                out[k, i] = w if w < cap_us else cap_us
+        return out
+
+    _offsets_block_impl = _offsets_block_jit
+    _waits_block_impl = _waits_block_jit
+else:
+    _offsets_block_impl = _offsets_block_np
+    _waits_block_impl = _waits_block_np
+
+
+# --------------------------
+# C extension (optional, preferred for offsets)
+# --------------------------
+def _offsets_block_c(a: np.ndarray, b: np.ndarray, ids: np.ndarray, M: int, pow2: bool) -> np.ndarray:
+    out = np.empty((a.shape[0], ids.shape[0]), dtype=np.int64)
+    _collatz_ext.offsets_block(
+        np.ascontiguousarray(a), np.ascontiguousarray(b), np.ascontiguousarray(ids), M, pow2, out
+    )
+    return out
+
+
+if _collatz_ext is not None:
+    _offsets_block_impl = _offsets_block_c
+
+
+def offsets_block(a_tbl, b_tbl, ids, M: int, pow2: bool) -> np.ndarray:
+    """(K, N) int64 matrix of (a_k * id + b_k) mod M."""
+    a = np.asarray(a_tbl, dtype=np.int64)
+    b = np.asarray(b_tbl, dtype=np.int64)
+    ids = np.asarray(ids, dtype=np.int64)
+    return _offsets_block_impl(a, b, ids, M, pow2)
+
+
+def waits_block(a_tbl, b_tbl, base_us_tbl, ids, M: int, pow2: bool, slot_us: int, cap_us: int) -> np.ndarray:
+    """(K, N) int64 matrix of min(cap_us, base_us_k + offset * slot_us)."""
+    a = np.asarray(a_tbl, dtype=np.int64)
+    b = np.asarray(b_tbl, dtype=np.int64)
+    base_us = np.asarray(base_us_tbl, dtype=np.int64)
+    ids = np.asarray(ids, dtype=np.int64)
+    return _waits_block_impl(a, b, base_us, ids, M, pow2, slot_us, cap_us)
@@ -1,8 +1,11 @@
 from __future__ import annotations
 
 import os
-import re
+import sys
 import math
+import threading
+import functools
+import zlib
 from dataclasses import dataclass
 
 
@@ -15,33 +18,39 @@ def collatz_step(n: int) -> int:
 
 
 def collatz_iter(seed: int, k: int) -> int:
-    """Iterate Collatz k times."""
+    """
+    Iterate Collatz k times.
+    Runs of even steps are collapsed into a single shift by trailing zeros.
+    """
     n = int(seed)
-    for _ in range(k):
-        n = collatz_step(n)
+    remaining = k
+    while remaining > 0:
+        if n & 1:
+            n = (3 * n + 1) >> 1
+            remaining -= 1
+        elif n == 0:
+            break  # 0 is a fixed point
+        else:
+            tz = min((n & -n).bit_length() - 1, remaining)
+            n >>= tz
+            remaining -= tz
     return n
 
 
 # --------------------------
 # Kubernetes helper (StatefulSet ordinal)
 # --------------------------
-_ORD_RE = re.compile(r".*-(\d+)$")
-
-
 def statefulset_ordinal(pod_name: str) -> int:
     """
     Extract ordinal from StatefulSet pod name: "app-3" -> 3
     Fallback: deterministic tiny hash if not matched.
     """
-    m = _ORD_RE.match(pod_name or "")
-    if m:
-        return int(m.group(1))
+    _, sep, tail = (pod_name or "").rpartition("-")
+    if sep and tail.isdecimal():
+        return int(tail)
 
-    # fallback hash (stable, low-cost)
-    h = 0
-    for ch in (pod_name or "unknown"):
-        h = (h * 131 + ord(ch)) & 0xFFFFFFFF
-    return int(h)
+    # fallback hash (stable across processes, uint32)
+    return zlib.crc32((pod_name or "unknown").encode())
 
 
 def env_int(key: str, default: int) -> int:
@@ -113,17 +122,98 @@ class CollatzBackoff:
       - gcd(a_k, M) = 1  (if M is power-of-two, any odd a_k works)
     """
 
-    def __init__(self, cfg: BackoffConfig):
+    __slots__ = (
+        "cfg",
+        "_M",
+        "_pow2",
+        "_mask",
+        "_slot_us",
+        "_cap_us",
+        "_collatz_n",
+        "_a_tbl",
+        "_b_tbl",
+        "_base_us",
+        "_capped_from",
+        "_wait_fn",
+        "_lock",
+    )
+
+    def __init__(self, cfg: BackoffConfig, max_k: int = 64):
         cfg.validate()
         self.cfg = cfg
 
-    def affine_params(self, k: int) -> tuple[int, int]:
-        """
-        Return (a_k, b_k). We force a_k invertible mod M.
-        If M is power-of-two, odd a_k is invertible.
-        """
-        M = self.cfg.slots_M
-        n = collatz_iter(self.cfg.collatz_seed, k + 1)
+        # Hot-path constants, cached once per instance.
+        self._M = cfg.slots_M
+        self._pow2 = (self._M & (self._M - 1)) == 0
+        self._mask = self._M - 1
+        self._slot_us = cfg.slot_ms * 1000
+        self._cap_us = int(round(cfg.cap_seconds * 1_000_000))
+
+        # (a_k, b_k) and capped exponential base per retry step;
+        # extended lazily past max_k. _collatz_n is the Collatz iterate
+        # after len(_a_tbl) steps, so growing the tables costs one step per k.
+        self._collatz_n = int(cfg.collatz_seed)
+        # Instances are shared across threads (see _backoff_for); growth is
+        # serialized so concurrent callers never append the same k twice.
+        self._lock = threading.Lock()
+        self._a_tbl: list[int] = []
+        self._b_tbl: list[int] = []
+        self._base_us: list[int] = []
+        # First k whose base alone reaches the cap; wait_micros returns
+        # cap_us directly from there on. sys.maxsize until the cap is seen.
+        self._capped_from = sys.maxsize
+        self._grow(max_k)
+
+        self._wait_fn = self._specialize_wait()
+
+    def __reduce__(self):
+        # The specialized closure and the lock cannot be pickled; rebuild
+        # (and re-specialize) from the config with the tables grown so far.
+        return (CollatzBackoff, (self.cfg, len(self._a_tbl)))
+
+    def _grow(self, n: int) -> None:
+        """Extend the per-step tables to cover k in [0..n-1]."""
+        cap_us = self._cap_us
+        with self._lock:
+            for k in range(len(self._a_tbl), n):
+                self._collatz_n = collatz_step(self._collatz_n)
+                a, b = self._affine_from_collatz(self._collatz_n)
+
+                # base_us is monotonic in k: once it reaches the cap it stays
+                # there, which also keeps huge k away from float overflow.
+                if k >= self._capped_from:
+                    base_us = cap_us
+                else:
+                    base_us = int(round(self.cfg.base_seconds * (1 << k) * 1_000_000))
+                    if base_us >= cap_us:
+                        self._capped_from = k
+                        base_us = cap_us
+
+                # Unlocked readers bound k by len(_a_tbl), so append a last.
+                self._base_us.append(base_us)
+                self._b_tbl.append(b)
+                self._a_tbl.append(a)
+
+    def _ensure_step(self, k: int) -> None:
+        """Validate retry step k and grow the tables to cover it."""
+        if k < 0:
+            raise ValueError("retry_k must be >= 0")
+        self._grow(k + 1)
+
+    def _ensure_steps(self, steps: int) -> None:
+        """Validate a step count and grow the tables to cover [0..steps-1]."""
+        if steps < 0:
+            raise ValueError("steps must be >= 0")
+        self._grow(steps)
+
+    def _affine_from_collatz(self, n: int) -> tuple[int, int]:
+        """(a, b) from the Collatz iterate n = collatz_iter(seed, k + 1)."""
+        M = self._M
+
+        # Power-of-two M: (n | 1) & (M - 1) is odd, hence non-zero and
+        # coprime to M, so no gcd check is needed.
+        if self._pow2:
+            return (n | 1) & self._mask, (n >> 3) & self._mask
 
         # Force odd, keep in [1..M-1] to avoid 0
         a = int((n | 1) % M)
@@ -139,28 +229,144 @@ class CollatzBackoff:
 
         return a, b
 
+    def affine_params(self, k: int) -> tuple[int, int]:
+        """
+        Return (a_k, b_k). We force a_k invertible mod M.
+        If M is power-of-two, odd a_k is invertible.
+        """
+        if not 0 <= k < len(self._a_tbl):
+            self._ensure_step(k)
+        return self._a_tbl[k], self._b_tbl[k]
+
     def offset_slot(self, node_id: int, retry_k: int) -> int:
-        """Deterministic per-step slot index in [0..M-1]."""
-        M = self.cfg.slots_M
-        a, b = self.affine_params(retry_k)
-        return (a * int(node_id) + b) % M
+        """
+        Deterministic per-step slot index in [0..M-1].
+        node_id must already be an int (e.g. from statefulset_ordinal).
+        """
+        a_tbl = self._a_tbl
+        if not 0 <= retry_k < len(a_tbl):
+            self._ensure_step(retry_k)
+        x = a_tbl[retry_k] * node_id + self._b_tbl[retry_k]
+        return x & self._mask if self._pow2 else x % self._M
 
     def wait_micros(self, node_id: int, retry_k: int) -> int:
         """
         Integer wait time in microseconds (avoids float equality issues).
         """
-        base_us = int(round(self.cfg.base_seconds * (2 ** retry_k) * 1_000_000))
-        jitter_us = int(self.offset_slot(node_id, retry_k) * self.cfg.slot_ms * 1000)
-        cap_us = int(round(self.cfg.cap_seconds * 1_000_000))
-        return min(cap_us, base_us + jitter_us)
+        return self._wait_fn(node_id, retry_k)
+
+    def _wait_micros_generic(self, node_id: int, retry_k: int) -> int:
+        if retry_k >= self._capped_from:
+            return self._cap_us
+        a_tbl = self._a_tbl
+        if not 0 <= retry_k < len(a_tbl):
+            self._ensure_step(retry_k)
+        x = a_tbl[retry_k] * node_id + self._b_tbl[retry_k]
+        offset = x & self._mask if self._pow2 else x % self._M
+        return min(self._cap_us, self._base_us[retry_k] + offset * self._slot_us)
+
+    def _specialize_wait(self):
+        """
+        Compile a wait_micros for this instance with M, slot size, cap and
+        saturation step baked in as constants. The tables are bound as
+        closure cells (they only ever grow in place); negative steps and
+        steps past the current tables go through _wait_micros_generic.
+        """
+        cap_us = self._cap_us
+        reduce = f"& {self._mask}" if self._pow2 else f"% {self._M}"
+        lines = [
+            "def _make(a_tbl, b_tbl, base_us, generic):",
+            "    def wait_micros(node_id, retry_k):",
+            "        if retry_k < 0:",
+            "            return generic(node_id, retry_k)",
+        ]
+        if self._capped_from != sys.maxsize:
+            lines += [
+                f"        if retry_k >= {self._capped_from}:",
+                f"            return {cap_us}",
+            ]
+        lines += [
+            "        try:",
+            "            w = base_us[retry_k] + (",
+            f"                (a_tbl[retry_k] * node_id + b_tbl[retry_k]) {reduce}",
+            f"            ) * {self._slot_us}",
+            "        except IndexError:",
+            "            return generic(node_id, retry_k)",
+            f"        return w if w < {cap_us} else {cap_us}",
+            "    return wait_micros",
+        ]
+        ns: dict = {}
+        exec(compile("\n".join(lines), "<collatz_backoff.wait_micros>", "exec"), ns)
+        return ns["_make"](self._a_tbl, self._b_tbl, self._base_us, self._wait_micros_generic)
+
+    def offset_slot_batch(self, ids, retry_k: int):
+        """
+        Slot indices at one retry step for an array of ids, as an int64
+        NumPy array. Requires NumPy.
+        """
+        import numpy as np
+
+        a, b = self.affine_params(retry_k)
+        x = a * np.asarray(ids, dtype=np.int64) + b
+        if self._pow2:
+            return x & self._mask
+        return x % self._M
+
+    def wait_micros_batch(self, ids, retry_k: int):
+        """
+        Integer waits in microseconds at one retry step for an array of ids,
+        as an int64 NumPy array. Requires NumPy.
+        """
+        import numpy as np
+
+        offs = self.offset_slot_batch(ids, retry_k)
+        return np.minimum(self._cap_us, self._base_us[retry_k] + offs * self._slot_us)
+
+    def offsets_block(self, ids, steps: int):
+        """
+        Slot indices for retry steps [0..steps-1] over an array of ids,
+        as a (steps, len(ids)) int64 NumPy array. Requires NumPy; uses Numba
+        kernels when Numba is installed.
+        """
+        from . import _kernels
+
+        self._ensure_steps(steps)
+        return _kernels.offsets_block(
+            self._a_tbl[:steps], self._b_tbl[:steps], ids, self._M, self._pow2
+        )
+
+    def wait_micros_block(self, ids, steps: int):
+        """
+        Integer waits in microseconds for retry steps [0..steps-1] over an
+        array of ids, as a (steps, len(ids)) int64 NumPy array.
+        """
+        from . import _kernels
+
+        self._ensure_steps(steps)
+        return _kernels.waits_block(
+            self._a_tbl[:steps],
+            self._b_tbl[:steps],
+            self._base_us[:steps],
+            ids,
+            self._M,
+            self._pow2,
+            self._slot_us,
+            self._cap_us,
+        )
 
     def wait_seconds(self, node_id: int, retry_k: int) -> float:
         """Float wait time in seconds."""
-        return self.wait_micros(node_id, retry_k) / 1_000_000.0
+        return self._wait_fn(node_id, retry_k) / 1_000_000.0
+
+
+@functools.lru_cache(maxsize=8)
+def _backoff_for(cfg: BackoffConfig) -> CollatzBackoff:
+    # BackoffConfig is frozen (hashable), so equal configs share one instance
+    return CollatzBackoff(cfg)
 
 
 def collatz_seeded_backoff_seconds(node_id: int, retry_k: int, cfg: BackoffConfig) -> float:
     """
     Compute backoff in seconds using the deterministic Collatz-seeded schedule.
     """
-    return CollatzBackoff(cfg).wait_seconds(node_id, retry_k)
+    return _backoff_for(cfg).wait_seconds(node_id, retry_k)
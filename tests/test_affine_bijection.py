@@ -16,3 +16,13 @@ def test_affine_is_bijection_full_range(M: int, k: int) -> None:
     ids = list(range(M))
     offsets = [b.offset_slot(i, k) for i in ids]
     assert len(offsets) == len(set(offsets))
+
+
+@pytest.mark.parametrize("M", [8, 12, 100, 1024])
+def test_offset_slot_matches_modular_formula(M: int) -> None:
+    cfg = BackoffConfig(slots_M=M, collatz_seed=27, slot_ms=1)
+    b = CollatzBackoff(cfg)
+
+    for k in range(10):
+        a, bb = b.affine_params(k)
+        assert all(b.offset_slot(i, k) == (a * i + bb) % M for i in range(2 * M))
@@ -1,6 +1,12 @@
+import copy
+import pickle
+import sys
+import threading
+
 import pytest
 
-from collatz_backoff import BackoffConfig, CollatzBackoff
+from collatz_backoff import BackoffConfig, CollatzBackoff, collatz_seeded_backoff_seconds
+from collatz_backoff.core import _backoff_for
 
 
 @pytest.mark.parametrize("node_id", [0, 1, 7, 13])
@@ -22,3 +28,122 @@ def test_wait_is_deterministic(node_id: int, k: int) -> None:
     s1 = b.wait_seconds(node_id, k)
     s2 = b.wait_seconds(node_id, k)
     assert s1 == s2
+
+
+@pytest.mark.parametrize("k", [0, 3, 7, 8, 20])
+def test_lazy_table_growth_matches_precomputed(k: int) -> None:
+    cfg = BackoffConfig(slots_M=128, collatz_seed=27)
+    small = CollatzBackoff(cfg, max_k=4)
+    large = CollatzBackoff(cfg, max_k=32)
+
+    assert small.affine_params(k) == large.affine_params(k)
+    assert small.wait_micros(5, k) == large.wait_micros(5, k)
+
+
+def test_free_function_matches_instance() -> None:
+    cfg = BackoffConfig(slots_M=64, collatz_seed=11)
+    b = CollatzBackoff(cfg)
+
+    for k in range(10):
+        assert collatz_seeded_backoff_seconds(3, k, cfg) == b.wait_seconds(3, k)
+
+
+@pytest.mark.parametrize("max_k", [2, 64])
+def test_wait_saturates_at_cap(max_k: int) -> None:
+    cfg = BackoffConfig(slots_M=64, base_seconds=0.05, cap_seconds=10.0)
+    b = CollatzBackoff(cfg, max_k=max_k)
+
+    # 0.05 * 2**7 = 6.4s < cap; 0.05 * 2**8 = 12.8s >= cap
+    assert b.wait_micros(3, 7) < 10_000_000
+    for k in (8, 9, 50, 5000):
+        assert b.wait_micros(3, k) == 10_000_000
+
+
+@pytest.mark.parametrize(
+    "cfg,max_k",
+    [
+        (BackoffConfig(slots_M=128), 64),
+        (BackoffConfig(slots_M=100, slot_ms=3), 64),
+        (BackoffConfig(slots_M=64, base_seconds=0.001, cap_seconds=1e6), 4),
+    ],
+)
+def test_specialized_wait_matches_generic(cfg: BackoffConfig, max_k: int) -> None:
+    b = CollatzBackoff(cfg, max_k=max_k)
+    ref = CollatzBackoff(cfg, max_k=max_k)
+
+    for k in range(40):
+        for node_id in range(0, 2 * cfg.slots_M, 7):
+            assert b.wait_micros(node_id, k) == ref._wait_micros_generic(node_id, k)
+
+
+def test_negative_retry_step_is_rejected() -> None:
+    b = CollatzBackoff(BackoffConfig(slots_M=128))
+
+    with pytest.raises(ValueError):
+        b.affine_params(-1)
+    with pytest.raises(ValueError):
+        b.offset_slot(3, -1)
+    with pytest.raises(ValueError):
+        b.wait_micros(3, -1)
+    with pytest.raises(ValueError):
+        b._wait_micros_generic(3, -1)
+
+
+def test_negative_block_steps_is_rejected() -> None:
+    np = pytest.importorskip("numpy")
+    b = CollatzBackoff(BackoffConfig(slots_M=128))
+
+    with pytest.raises(ValueError):
+        b.offsets_block(np.arange(4), -2)
+    with pytest.raises(ValueError):
+        b.wait_micros_block(np.arange(4), -2)
+    assert b.offsets_block(np.arange(4), 0).shape == (0, 4)
+
+
+def test_concurrent_lazy_growth_keeps_tables_aligned() -> None:
+    cfg = BackoffConfig(slots_M=1024)
+    ref = CollatzBackoff(cfg, max_k=2000)
+    b = CollatzBackoff(cfg)
+
+    def worker() -> None:
+        for k in range(64, 2000, 97):
+            b.affine_params(k)
+        b.affine_params(1999)
+
+    interval = sys.getswitchinterval()
+    sys.setswitchinterval(1e-6)
+    try:
+        threads = [threading.Thread(target=worker) for _ in range(8)]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+    finally:
+        sys.setswitchinterval(interval)
+
+    assert [b.affine_params(k) for k in range(2000)] == [ref.affine_params(k) for k in range(2000)]
+
+
+@pytest.mark.parametrize("cfg", [BackoffConfig(), BackoffConfig(slots_M=100, slot_ms=3)])
+def test_pickle_round_trip(cfg: BackoffConfig) -> None:
+    b = CollatzBackoff(cfg, max_k=4)
+    b.affine_params(80)
+
+    restored = pickle.loads(pickle.dumps(b))
+    assert restored.cfg == b.cfg
+    assert restored.affine_params(80) == b.affine_params(80)
+    for k in range(0, 90, 7):
+        for i in range(0, 300, 13):
+            assert restored.wait_micros(i, k) == b.wait_micros(i, k)
+
+
+def test_copies_of_shared_instance_get_their_own_lock_and_tables() -> None:
+    cfg = BackoffConfig(slots_M=64, collatz_seed=5)
+    collatz_seeded_backoff_seconds(1, 0, cfg)  # populate the shared cache
+    b = _backoff_for(cfg)
+
+    for dup in (copy.copy(b), copy.deepcopy(b), pickle.loads(pickle.dumps(b))):
+        assert dup is not b
+        assert dup._lock is not b._lock
+        assert dup._a_tbl is not b._a_tbl
+        assert dup.wait_micros(7, 3) == b.wait_micros(7, 3)
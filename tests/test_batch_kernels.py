@@ -0,0 +1,59 @@
+import pytest
+
+np = pytest.importorskip("numpy")
+
+from collatz_backoff import BackoffConfig, CollatzBackoff
+from collatz_backoff import _kernels
+
+
+@pytest.mark.parametrize("M", [16, 100, 1024])
+def test_offsets_block_matches_scalar(M: int) -> None:
+    b = CollatzBackoff(BackoffConfig(slots_M=M, collatz_seed=27))
+    ids = np.arange(M, dtype=np.int64)
+
+    block = b.offsets_block(ids, 12)
+    assert block.shape == (12, M)
+    for k in range(12):
+        assert block[k].tolist() == [b.offset_slot(i, k) for i in range(M)]
+
+
+@pytest.mark.parametrize("M", [16, 100, 1024])
+def test_wait_micros_block_matches_scalar(M: int) -> None:
+    b = CollatzBackoff(BackoffConfig(slots_M=M, collatz_seed=27, slot_ms=2, cap_seconds=3.0))
+    ids = np.arange(M, dtype=np.int64)
+
+    block = b.wait_micros_block(ids, 12)
+    for k in range(12):
+        assert block[k].tolist() == [b.wait_micros(i, k) for i in range(M)]
+
+
+def test_numpy_fallback_matches_kernel() -> None:
+    b = CollatzBackoff(BackoffConfig(slots_M=100, collatz_seed=27))
+    a = np.asarray(b._a_tbl[:8], dtype=np.int64)
+    bb = np.asarray(b._b_tbl[:8], dtype=np.int64)
+    ids = np.arange(250, dtype=np.int64)
+
+    expected = _kernels._offsets_block_np(a, bb, ids, 100, False)
+    assert np.array_equal(_kernels.offsets_block(a, bb, ids, 100, False), expected)
+
+
+@pytest.mark.parametrize("M", [16, 100, 1024])
+@pytest.mark.parametrize("k", [0, 3, 9, 70])
+def test_batch_matches_scalar(M: int, k: int) -> None:
+    b = CollatzBackoff(BackoffConfig(slots_M=M, collatz_seed=27, slot_ms=2))
+    ids = np.arange(M, dtype=np.int64)
+
+    assert b.offset_slot_batch(ids, k).tolist() == [b.offset_slot(i, k) for i in range(M)]
+    assert b.wait_micros_batch(ids, k).tolist() == [b.wait_micros(i, k) for i in range(M)]
+
+
+@pytest.mark.parametrize("M,pow2", [(1024, True), (100, False)])
+def test_c_extension_matches_numpy(M: int, pow2: bool) -> None:
+    pytest.importorskip("collatz_backoff._collatz_ext")
+    b = CollatzBackoff(BackoffConfig(slots_M=M, collatz_seed=27))
+    a = np.asarray(b._a_tbl[:8], dtype=np.int64)
+    bb = np.asarray(b._b_tbl[:8], dtype=np.int64)
+    ids = np.arange(-50, 250, dtype=np.int64)
+
+    expected = _kernels._offsets_block_np(a, bb, ids, M, pow2)
+    assert np.array_equal(_kernels._offsets_block_c(a, bb, ids, M, pow2), expected)
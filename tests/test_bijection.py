@@ -1,6 +1,6 @@
 import math
+import numpy as np
 import pytest
-from hypothesis import given, settings, strategies as st
 
 from collatz_backoff import BackoffConfig, CollatzBackoff
 
@@ -9,19 +9,19 @@ def is_power_of_two(x: int) -> bool:
     return x > 0 and (x & (x - 1)) == 0
 
 
-@settings(max_examples=80, deadline=None)
-@given(
-    M=st.sampled_from([8, 16, 32, 64, 128, 256, 512, 1024]),
-    seed=st.integers(min_value=1, max_value=10_000),
-    k=st.integers(min_value=0, max_value=50),
-    n=st.integers(min_value=2, max_value=200),
-)
-def test_affine_is_bijection_on_id_range(M, seed, k, n):
+POW2_M = [8, 16, 32, 64, 128, 256, 512, 1024]
+SEEDS = [1, 17, 27, 97, 871, 9_999]
+
+
+@pytest.mark.parametrize("M", POW2_M)
+@pytest.mark.parametrize("seed", SEEDS)
+@pytest.mark.parametrize("k", range(13))
+def test_affine_is_bijection_on_id_range(M, seed, k):
     """
-    For M power-of-two and n <= M, offset_slot(id,k) should be injective over ids [0..n-1].
+    For M power-of-two, offset_slot(id,k) should be a bijection over ids [0..M-1]
+    (and therefore injective over any id range of size <= M).
     """
     assert is_power_of_two(M)
-    n = min(n, M)
 
     cfg = BackoffConfig(slots_M=M, collatz_seed=seed, slot_ms=1)
     b = CollatzBackoff(cfg)
@@ -29,30 +29,26 @@ def test_affine_is_bijection_on_id_range(M, seed, k, n):
     a, _ = b.affine_params(k)
     assert math.gcd(a, M) == 1  # required for bijection
 
-    ids = list(range(n))
-    offsets = [b.offset_slot(i, k) for i in ids]
-    assert len(offsets) == len(set(offsets)), "collision: offsets not unique"
+    offsets = b.offset_slot_batch(np.arange(M), k)
+    assert np.unique(offsets).size == offsets.size, "collision: offsets not unique"
 
 
-@settings(max_examples=60, deadline=None)
-@given(
-    M=st.sampled_from([32, 64, 128, 256, 512, 1024]),
-    seed=st.integers(min_value=1, max_value=10_000),
-    n=st.integers(min_value=2, max_value=200),
-)
-def test_no_wait_collisions_across_multiple_steps(M, seed, n):
+@pytest.mark.parametrize("M", POW2_M[2:])
+@pytest.mark.parametrize("seed", SEEDS)
+def test_no_wait_collisions_across_multiple_steps(M, seed):
     """
     Check that integer wait times are collision-free for each retry step
-    over ids [0..n-1], when n <= M.
+    over ids [0..M-1].
+    The cap is set above every base in range: once waits saturate at the
+    cap they collide by design.
     """
-    n = min(n, M)
-    cfg = BackoffConfig(slots_M=M, collatz_seed=seed, slot_ms=1, base_seconds=0.05)
+    cfg = BackoffConfig(slots_M=M, collatz_seed=seed, slot_ms=1, base_seconds=0.05, cap_seconds=1000.0)
     b = CollatzBackoff(cfg)
 
-    ids = list(range(n))
+    ids = np.arange(M)
     for k in range(0, 12):
-        waits = [b.wait_micros(i, k) for i in ids]
-        assert len(waits) == len(set(waits)), f"collision at retry step k={k}"
+        waits = b.wait_micros_batch(ids, k)
+        assert np.unique(waits).size == waits.size, f"collision at retry step k={k}"
 
 
 def test_documented_constraint_replica_overflow_causes_collisions():
@@ -61,7 +57,7 @@ def test_documented_constraint_replica_overflow_causes_collisions():
     """
     cfg = BackoffConfig(slots_M=16, collatz_seed=27, slot_ms=1)
     b = CollatzBackoff(cfg)
-    ids = list(range(32))  # > M
+    ids = np.arange(32)  # > M
 
-    offsets = [b.offset_slot(i, 3) for i in ids]
-    assert len(offsets) != len(set(offsets)), "should collide when n > M"
+    offsets = b.offset_slot_batch(ids, 3)
+    assert np.unique(offsets).size != offsets.size, "should collide when n > M"
@@ -0,0 +1,12 @@
+import pytest
+
+from collatz_backoff import collatz_iter, collatz_step
+
+
+@pytest.mark.parametrize("seed", [0, 1, 2, 7, 27, 96, 1 << 40, -5, -17])
+@pytest.mark.parametrize("k", [0, 1, 2, 5, 13, 64])
+def test_collatz_iter_matches_stepwise(seed: int, k: int) -> None:
+    n = seed
+    for _ in range(k):
+        n = collatz_step(n)
+    assert collatz_iter(seed, k) == n
@@ -0,0 +1,24 @@
+import pytest
+
+from collatz_backoff import statefulset_ordinal
+
+
+@pytest.mark.parametrize(
+    "pod_name,expected",
+    [
+        ("app-3", 3),
+        ("collatz-demo-12", 12),
+        ("a-b-42", 42),
+        ("a-0007", 7),
+        ("-7", 7),
+    ],
+)
+def test_ordinal_from_pod_name(pod_name: str, expected: int) -> None:
+    assert statefulset_ordinal(pod_name) == expected
+
+
+@pytest.mark.parametrize("pod_name", ["app", "app-", "app-3x", "", None])
+def test_ordinal_fallback_is_stable_uint32(pod_name) -> None:
+    h = statefulset_ordinal(pod_name)
+    assert h == statefulset_ordinal(pod_name)
+    assert 0 <= h <= 0xFFFFFFFF